@@ -1,11 +1,14 @@
 """
 This module defines constant values related to GTA formatting for better organization
 and readability of the code.
-    HUD_COLORS (dict): A dictionary containing RGBA values for various HUD colors used in the game.
+    HUD_COLORS (MappingProxyType): A read-only mapping containing RGBA values for various HUD colors used in the game.
     FORMAT_REPLACEMENT_TABLE (list): A list of replacement rules used to map formatting tags to their corresponding HUD color tags.
     TEXT_FORMATTING_REGEX (str): A regular expression pattern for detecting various text formatting tags in GTA strings.
 """
-HUD_COLORS = {
+from types import MappingProxyType
+
+
+HUD_COLORS = MappingProxyType({
     "HUD_COLOUR_PURE_WHITE": "rgba(255, 255, 255, 255)",
     "HUD_COLOUR_WHITE": "rgba(240, 240, 240, 255)",
     "HUD_COLOUR_BLACK": "rgba(0, 0, 0, 255)",
@@ -240,7 +243,7 @@ HUD_COLORS = {
     "HUD_COLOUR_PLACEHOLDER_08": "rgba(255, 255, 255, 255)",
     "HUD_COLOUR_PLACEHOLDER_09": "rgba(255, 255, 255, 255)",
     "HUD_COLOUR_PLACEHOLDER_10": "rgba(255, 255, 255, 255)"
-}
+})
 
 FORMAT_REPLACEMENT_TABLE = [
     [r"~r~", '~HUD_COLOUR_RED~'],
@@ -5,59 +5,84 @@ This module provides functions to convert GTA-formatted text into HTML for previ
 It utilizes GTA text formatting constants and rules defined in 'lib.gta_text_formatting'.
 
 Functions:
-    regex_replace_multiple(text: str, replacement_table: list[list[str]]) -> str:
-        Replaces multiple patterns in a text using a given replacement table.
-    formatted_string_to_html(text: str) -> dominate.tags.span:
-        Converts a GTA-formatted string into an HTML span element with appropriate styles.
+    replace_short_formatting(text: str) -> str:
+        Replaces the short GTA formatting tags with their long HUD color equivalents.
+    custom_color_to_css(formatting: str) -> str:
+        Converts a GTA custom color tag into a CSS color, caching the result.
+    formatted_string_to_html(text: str, unknown_colors: list[str] | None = None) -> dominate.util.raw:
+        Converts a GTA-formatted string into raw HTML span elements with appropriate styles.
     create_html_doc() -> dominate.document:
         Creates an HTML document with predefined styles for text formatting preview.
 """
+import functools
 import re
 import dominate
 import dominate.tags
+import dominate.util
 from .gta_text_formatting import HUD_COLORS, FORMAT_REPLACEMENT_TABLE, LONG_TEXT_FORMATTING_REGEX
 
 
-def regex_replace_multiple(text: str, replacement_table: list[list[str]]) -> str:
+DEFAULT_COLOR = "rgb(205,205,205)"
+FORMAT_REPLACEMENT_MAP = dict(FORMAT_REPLACEMENT_TABLE)
+FORMAT_REPLACEMENT_PATTERN = re.compile("|".join(re.escape(tag) for tag in FORMAT_REPLACEMENT_MAP))
+LONG_TEXT_FORMATTING_PATTERN = re.compile(f"({LONG_TEXT_FORMATTING_REGEX})")
+
+
+def replace_short_formatting(text: str) -> str:
     """
-    Replace multiple patterns in a text using a specified replacement table.
+    Replace the short formatting tags of FORMAT_REPLACEMENT_TABLE in a single pass over the text.
 
     Args:
         text (str): The input text where replacements will be applied.
-        replacement_table (list[list[str]]): A list of replacement pairs, where each pair
-      is represented as a list containing two strings: the pattern to search for and
-      the replacement string.
 
     Returns:
         str: The modified text after applying all replacements.
     """
-    for replacement in replacement_table:
-        text = re.sub(replacement[0], replacement[1], text)
-    return text
+    return FORMAT_REPLACEMENT_PATTERN.sub(lambda match: FORMAT_REPLACEMENT_MAP[match.group()], text)
 
 
-def formatted_string_to_html(text: str) -> dominate.tags.span:
+@functools.lru_cache(maxsize=256)
+def custom_color_to_css(formatting: str) -> str:
     """
-    Convert a formatted text string to an HTML representation using dominate.
+    Convert a custom color formatting tag to a CSS color, so repeated colors are only parsed once.
+
+    Args:
+        formatting (str): The custom color tag, in the form '~CC_<red>_<green>_<blue>~'.
+
+    Returns:
+        str: The CSS rgba() color of the tag.
+    """
+    red, green, blue = formatting[4:-1].split("_")
+    return f"rgba({red}, {green}, {blue}, 255)"
+
+
+def formatted_string_to_html(text: str, unknown_colors: list[str] | None = None) -> dominate.util.raw:
+    """
+    Convert a formatted text string to an HTML representation.
+
+    The markup is built as a list of strings and added to the current dominate context
+    as a single raw node, instead of creating a dominate tag for every fragment.
 
     Args:
         text (str): The input text with special formatting markers.
+        unknown_colors (list[str] | None): If given, the names of HUD colors missing from HUD_COLORS
+      are appended to it. Those colors are previewed as DEFAULT_COLOR.
 
     Returns:
-        dominate.tags.span: A Dominate span element representing the formatted HTML.
+        dominate.util.raw: A Dominate raw node containing the formatted HTML span.
     """
-    main_container: dominate.tags.span = dominate.tags.span()
-    text = regex_replace_multiple(text, FORMAT_REPLACEMENT_TABLE)
+    text = replace_short_formatting(text)
     bolded = False
     italic = False
-    color = "rgb(205,205,205)"
+    color = DEFAULT_COLOR
     condensed = 0
     new_line = False
-    text_fragments = re.split(LONG_TEXT_FORMATTING_REGEX, text)
-    matched_actions = re.findall(LONG_TEXT_FORMATTING_REGEX, text)
-    with main_container:
-        if text_fragments[0] != "":
-            dominate.tags.span(text_fragments[0], style=f"color: {color};")
+    split_text = LONG_TEXT_FORMATTING_PATTERN.split(text)
+    text_fragments = split_text[0::2]
+    matched_actions = split_text[1::2]
+    parts: list[str] = ["<span>"]
+    if text_fragments[0] != "":
+        parts.append(f'<span style="color: {color};">{dominate.util.escape(text_fragments[0])}</span>')
     for i, fragment in enumerate(text_fragments[1:]):
         formatting = matched_actions[i]
         match formatting:
@@ -71,13 +96,15 @@ def formatted_string_to_html(text: str) -> dominate.tags.span:
                 condensed -= 1
             case "~n~":
                 new_line = not new_line
-            case _:
-                hud_color_matches = re.findall(r"(?<=~)(HUD_COLOUR_.+?)(?=~)|(?<=~)(HC_.+?)(?=~)", formatting)
-                if hud_color_matches:
-                    color = HUD_COLORS[hud_color_matches[0][0]]
-                custom_color_matches = re.findall(r"(?<=~CC_)([0-9]{1,3}_[0-9]{1,3}_[0-9]{1,3})(?=~)", formatting)
-                if custom_color_matches:
-                    color = f'rgba(${custom_color_matches[0].split("_").join(",")})'
+            case _ if formatting.startswith("~HUD_COLOUR_") or formatting.startswith("~HC_"):
+                name = formatting[1:-1] if formatting.startswith("~HUD_COLOUR_") else "HUD_COLOUR_" + formatting[4:-1]
+                color = HUD_COLORS.get(name)
+                if color is None:
+                    color = DEFAULT_COLOR
+                    if unknown_colors is not None:
+                        unknown_colors.append(name)
+            case _ if formatting.startswith("~CC_"):
+                color = custom_color_to_css(formatting)
         classes = []
         if condensed > 0:
             classes.append("condensed")
@@ -87,16 +114,13 @@ def formatted_string_to_html(text: str) -> dominate.tags.span:
         if italic:
             style += "font-style: italic;"
         style += f"color: {color};"
-        with main_container:
-            if fragment != "":
-                with dominate.tags.span(fragment):
-                    if classes:
-                        dominate.tags.attr(cls=' '.join(classes), style=style)
-                    else:
-                        dominate.tags.attr(style=style)
-            if new_line:
-                dominate.tags.br()
-    return main_container
+        if fragment != "":
+            class_attr = f' class="{" ".join(classes)}"' if classes else ""
+            parts.append(f'<span{class_attr} style="{style}">{dominate.util.escape(fragment)}</span>')
+        if new_line:
+            parts.append("<br>")
+    parts.append("</span>")
+    return dominate.util.raw("".join(parts))
 
 
 def create_html_doc() -> dominate.document:
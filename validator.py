@@ -1,53 +1,136 @@
 """Module providing a static class for validating XML localization files."""
 import argparse
+import importlib
+import io
 import json
 import sys
-import xml.dom.minidom
-import xml.sax
-import xml.sax.xmlreader
 import re
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from itertools import islice
+from types import ModuleType
 from typing import TypeVar, Optional
+from lxml import etree
 
 
 T = TypeVar("T")
-COLORAMA_INSTALLED = True
-DOMINATE_INSTALLED  = True
-XML_LANG_ATTRIB =  "xml:lang"
+FILE_PREFETCH_COUNT = 4
+XML_LANG_ATTRIB =  "{http://www.w3.org/XML/1998/namespace}lang"
+KNOWN_ENTRY_ATTRIBS = frozenset({"Id"})
+KNOWN_STRING_ATTRIBS = frozenset({XML_LANG_ATTRIB})
 SHORT_GTA_FORMAT_REGEX = r"~(?:[s,b,r,n,y,p,g,o,h,c]|HUD_COLOUR_NET_PLAYER1)~"
 TOO_MANY_SPACES_REGEX = r"\s~[s,b,r,n,y,p,g,o,h,c]~\s|\s\s+"
 TEXT_VARIABLE_REGEX = r"{[0-9]+}"
 PUNCTUATION_MARKS_REGEX = r"[.,?,!]"
 WRONG_PUNCTUATION_REGEX = r"\s" + PUNCTUATION_MARKS_REGEX + r"|\s" + SHORT_GTA_FORMAT_REGEX + PUNCTUATION_MARKS_REGEX
+SHORT_GTA_FORMAT_PATTERN = re.compile(SHORT_GTA_FORMAT_REGEX)
+TOO_MANY_SPACES_PATTERN = re.compile(TOO_MANY_SPACES_REGEX)
+TEXT_VARIABLE_PATTERN = re.compile(TEXT_VARIABLE_REGEX)
+WRONG_PUNCTUATION_PATTERN = re.compile(WRONG_PUNCTUATION_REGEX)
+TEXT_TOKEN_PATTERN = re.compile(rf"(?P<format>{SHORT_GTA_FORMAT_REGEX})|(?P<variable>{TEXT_VARIABLE_REGEX})|(?P<tilde>~)")
+ERROR_STYLE = FATAL_ERROR_STYLE = WARNING_STYLE = ("", "")
+_OPTIONAL_MODULES: dict[str, ModuleType | None] = {}
 
 
-try:
-    import colorama
-except ModuleNotFoundError:
-    COLORAMA_INSTALLED = False
+def _import_optional(name: str) -> ModuleType | None:
+    """
+    Imports an optional dependency the first time it is needed.
+
+    Args:
+        name (str): The name of the module to import.
+
+    Returns:
+        ModuleType | None: The module, or None if it is not installed.
+    """
+    if name not in _OPTIONAL_MODULES:
+        try:
+            _OPTIONAL_MODULES[name] = importlib.import_module(name)
+        except ModuleNotFoundError:
+            _OPTIONAL_MODULES[name] = None
+    return _OPTIONAL_MODULES[name]
+
+
+def _get_colorama() -> ModuleType | None:
+    """
+    Imports colorama the first time it is needed.
+
+    Returns:
+        ModuleType | None: The colorama module, or None if it is not installed.
+    """
+    return _import_optional("colorama")
 
-try:
-    import dominate
-    import dominate.tags
-except ModuleNotFoundError:
-    DOMINATE_INSTALLED = False
 
+def _get_dominate() -> ModuleType | None:
+    """
+    Imports dominate with its tags the first time it is needed.
 
-if DOMINATE_INSTALLED:
-    import lib.html_preview
+    Returns:
+        ModuleType | None: The dominate package, or None if it is not installed.
+    """
+    if _import_optional("dominate.tags") is None:
+        return None
+    return _import_optional("dominate")
 
 
-def str_from_node(node: xml.dom.minidom.Node) -> str:
+def _get_html_preview() -> ModuleType | None:
     """
-    Extracts and concatenates the text content from the child nodes of the given XML DOM Node.
+    Imports the formatting preview module, which depends on dominate, the first time it is needed.
+
+    Returns:
+        ModuleType | None: The lib.html_preview module, or None if dominate is not installed.
+    """
+    return _import_optional("lib.html_preview")
+
+
+def read_file(file: str) -> bytes:
+    """
+    Reads the whole content of a file.
 
     Args:
-        node (xml.dom.minidom.Node): The XML DOM Node from which text content will be extracted.
+        file (str): The path of the file to read.
 
     Returns:
-        str: A string containing the concatenated text content of all child nodes with nodeType TEXT_NODE.
+        bytes: The content of the file.
     """
-    return "".join(t.nodeValue for t in node.childNodes if t.nodeType == t.TEXT_NODE)
+    with open(file, "rb") as binary_file:
+        return binary_file.read()
+
+
+def prefetch_files(files: list[str], count: int) -> Iterator[tuple[str, Future[bytes]]]:
+    """
+    Reads files in background threads, keeping up to a given number of reads ahead of the consumer.
+
+    Args:
+        files (list[str]): The paths of the files to read.
+        count (int): The number of files read ahead of the one being yielded.
+
+    Returns:
+        Iterator[tuple[str, Future[bytes]]]: The path of each file, in order, with the future of its content.
+    """
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        pending: deque[tuple[str, Future[bytes]]] = deque()
+        for file in files:
+            pending.append((file, pool.submit(read_file, file)))
+            if len(pending) > count:
+                yield pending.popleft()
+        yield from pending
+
+
+@lru_cache(maxsize=None)
+def get_start_tag_pattern(tag_name: str) -> re.Pattern[bytes]:
+    """
+    Compiles a pattern matching the start tags with the given name in a raw line of an XML file.
+
+    Args:
+        tag_name (str): The local name of the tag.
+
+    Returns:
+        re.Pattern[bytes]: The pattern, which doesn't match tags that only start with the given name.
+    """
+    return re.compile(b"<" + re.escape(tag_name.encode()) + rb"(?=[\s/>]|$)")
 
 
 def get_consecutive_duplicate(lst: list[T], exceptions: list[T] = None) -> Optional[T]:
@@ -70,6 +153,75 @@ def get_consecutive_duplicate(lst: list[T], exceptions: list[T] = None) -> Optio
     return None
 
 
+@dataclass
+class SourcePosition:
+    """
+    Data class locating the start tag of an XML Element, read from the raw line containing it.
+
+    Attributes:
+        line (int): The line of the start tag.
+        tag (str): The tag of the XML Element.
+        occurrence (int): The number of previous start tags with the same name on the line.
+        source_line (bytes): The raw line containing the start tag.
+
+    The column is only searched when an error or a warning is reported, which can happen after the XML Element
+    has been cleared, or in another process.
+    """
+    line: int
+    tag: str
+    occurrence: int
+    source_line: bytes
+
+    @staticmethod
+    def from_element(element: etree._Element) -> "SourcePosition":
+        """
+        Read the position of an XML Element of the file being validated.
+
+        Args:
+            element (etree._Element): The XML Element to locate.
+
+        Returns:
+            SourcePosition: The position of the start tag of the XML Element.
+        """
+        line = element.sourceline
+        return SourcePosition(line, element.tag, Validator.tag_occurrences.get(element, 0), Validator.source_lines[line - 1])
+
+    @cached_property
+    def cursor(self) -> tuple[int, int]:
+        """tuple[int, int]: The line and the column of the start tag."""
+        matches = get_start_tag_pattern(self.tag.rpartition("}")[2]).finditer(self.source_line)
+        match = next(islice(matches, self.occurrence, None), None)
+        return (self.line, 0 if match is None else match.start())
+
+
+@dataclass
+class TranslationInfo:
+    """
+    Data class representing a translation string of an entry, read once from its XML Element.
+
+    Attributes:
+        element (etree._Element): The XML Element of the translation string.
+        lang (Optional[str]): The 'xml:lang' attribute of the XML Element, if present.
+        text (str): The text of the translation string.
+
+    The positions are only computed when an error or a warning is reported.
+    """
+    element: etree._Element
+    lang: Optional[str]
+    text: str
+
+    @cached_property
+    def parse_position(self) -> tuple[int, int]:
+        """tuple[int, int]: The position of the XML Element in the file."""
+        return Validator.get_parse_position(self.element)
+
+    @cached_property
+    def text_position(self) -> tuple[int, int]:
+        """tuple[int, int]: The position of the text of the translation string in the file."""
+        return (self.parse_position[0],
+                self.parse_position[1]+len('<String xml:lang="')+len(self.lang)+len('">'))
+
+
 @dataclass
 class EntryInfo:
     """
@@ -77,13 +229,13 @@ class EntryInfo:
 
     Attributes:
         translations (List[str]): List of translations for the entry.
-        found_langs (List[str]): List of language codes found in the entry.
+        found_langs (Dict[str, TranslationInfo]): The translations found in the entry, keyed by language code.
         should_end_with_format (Optional[str]): The expected format tag for the last found format in the entry.
         required_text_formatting (Set[str]): Set of required text formatting tags in the entry.
         required_variables (List[str]): List of required variables in the entry.
     """
     translations: list[str] = field(default_factory=list)
-    found_langs: list[str] = field(default_factory=list)
+    found_langs: dict[str, TranslationInfo] = field(default_factory=dict)
     should_end_with_format: Optional[str] = field(default=None)
     required_text_formatting: set[str] = field(default_factory=set)
     required_variables: list[str] = field(default_factory=list)
@@ -96,8 +248,8 @@ class Validator:
 
     Attributes:
         xml_files (list[str]): A list of XML filenames to be validated.
-        supported_langs (list[str]): A list of supported language codes.
-        used_ids (set): A set of used IDs during validation.
+        supported_langs (frozenset[str]): A set of supported language codes.
+        used_ids (dict[str, str]): The IDs used during validation, mapped to the file where they were first found.
         fatal_errors (int): A count of encountered fatal errors during validation.
         errors (int): A count of encountered errors during validation.
         warnings (int): A count of encountered warnings during validation.
@@ -105,15 +257,18 @@ class Validator:
         show_lang (str | None): The selected language that is shown if missing.
         found_missing_lang (int): A count of missing localizations for selected language.
         total_strings (int): Total number of strings processed during validation.
-        custom_xml_parser (xml.sax.xmlreader.XMLReader): Custom parser for XML validation.
+        source_lines (list[bytes]): Raw lines of the XML file being validated, used to locate elements.
+        tag_occurrences (dict[etree._Element, int]): For the elements of the entry being validated, the number of
+    previous start tags with the same name on their line.
         preview_formatting (bool): Flag indicating whether preview formatting is enabled.
         main_doc (dominate.document): Main document used for validation.
         warnings_as_errors (bool): Flag indicating whether warnings should be treated as errors.
+        recorded_calls (list[tuple[str, tuple]] | None): Calls recorded while a file is validated instead of being executed.
     """
     xml_files: list[str] = []
-    supported_langs: list[str] = ["en-US", "de-DE", "fr-FR", "nl-NL", "it-IT", "es-ES", "pt-BR",
-        "pl-PL", "tr-TR", "ar-001", "zh-Hans", "zh-Hant", "hi-Latn", "vi-VN", "th-TH", "id-ID", "cs-CZ", "da-DK"]
-    used_ids: set[str] = set()
+    supported_langs: frozenset[str] = frozenset(["en-US", "de-DE", "fr-FR", "nl-NL", "it-IT", "es-ES", "pt-BR",
+        "pl-PL", "tr-TR", "ar-001", "zh-Hans", "zh-Hant", "hi-Latn", "vi-VN", "th-TH", "id-ID", "cs-CZ", "da-DK"])
+    used_ids: dict[str, str] = {}
     fatal_errors: int = 0
     errors: int = 0
     warnings: int = 0
@@ -121,36 +276,69 @@ class Validator:
     show_lang: str | None = None
     found_missing_lang: int = 0
     total_strings: int = 0
-    custom_xml_parser: xml.sax.xmlreader.XMLReader = None
+    source_lines: list[bytes] = []
+    tag_occurrences: dict[etree._Element, int] = {}
     preview_formatting: bool = False
     main_doc = None
     warnings_as_errors: bool = False
+    recorded_calls: list[tuple[str, tuple]] | None = None
 
     @staticmethod
-    def setup_xml_parser() -> xml.sax.xmlreader.XMLReader:
-        # pylint: disable=W0212
+    def configure(display_limit: int, show_lang: str | None, warnings_as_errors: bool):
         """
-        Set up a custom XML parser with additional functionality to track parse positions.
+        Set the options that affect validation.
+
+        Also used as the initializer of worker processes, which do not inherit them when spawned.
+
+        Args:
+            display_limit (int): Display limit for known elements.
+            show_lang (str | None): The selected language that is shown if missing.
+            warnings_as_errors (bool): Flag indicating whether warnings should be treated as errors.
+        """
+        Validator.display_limit = display_limit
+        Validator.show_lang = show_lang
+        Validator.warnings_as_errors = warnings_as_errors
+
+
+    @staticmethod
+    def record_call(name: str, *call_args) -> bool:
+        """
+        Record a call to a Validator method that prints or depends on state shared between files.
+
+        These calls are recorded while a file is validated, so that they can be dropped if the file turns out
+        to be malformed, and so that worker processes can send them to the main process to be replayed in file order,
+        producing the same output and counts as a serial run.
+
+        Args:
+            name (str): The name of the Validator method.
+            *call_args: The arguments of the call.
+
+        Returns:
+            bool: True if the call was recorded and must not be executed, False otherwise.
+        """
+        if Validator.recorded_calls is None:
+            return False
+        Validator.recorded_calls.append((name, call_args))
+        return True
+
+
+    @staticmethod
+    def get_parse_position(element: etree._Element) -> tuple[int, int]:
+        """
+        Get the position of the start tag of an XML element in the file being validated.
+
+        lxml only exposes the line of an element, so the column is recovered by searching
+        the start tag in the raw source line, which matches the byte offset reported by Expat.
+        Start tags with the same name on the same line are told apart by the occurrence counted
+        while parsing. Tags hidden in a comment on the same line are not skipped.
+
+        Args:
+            element (etree._Element): The XML element to locate.
 
         Returns:
-            xml.sax.xmlreader.XMLReader: A custom XML parser with extended features.
-        """
-        custom_xml_parser = xml.sax.make_parser()
-        orig_set_content_handler = custom_xml_parser.setContentHandler
-        def set_content_handler(dom_handler):
-            def start_element_ns(name, tag_name, attrs):
-                orig_start_cb(name, tag_name, attrs)
-                cur_elem = dom_handler.elementStack[-1]
-                cur_elem.parse_position = (
-                    custom_xml_parser._parser.CurrentLineNumber,
-                    custom_xml_parser._parser.CurrentColumnNumber
-                )
-
-            orig_start_cb = dom_handler.startElementNS
-            dom_handler.startElementNS = start_element_ns
-            orig_set_content_handler(dom_handler)
-        custom_xml_parser.setContentHandler = set_content_handler
-        return custom_xml_parser
+            tuple[int, int]: The line and the column of the start tag of the element.
+        """
+        return SourcePosition.from_element(element).cursor
 
 
     @staticmethod
@@ -173,6 +361,24 @@ class Validator:
         return string
 
 
+    @staticmethod
+    def write_message(marker: str, message: str, style: tuple[str, str], location: list[str],
+                      custom_file_cursor: tuple[int] | None = None):
+        """Writes a message with the given location to stdout as a single write.
+
+        Args:
+            marker (str): The marker printed before the location, such as '[!]'.
+            message (str): The message to print.
+            style (tuple[str, str]): The escape sequences written before and after the message.
+            location (list[str]): A list of strings representing the location of the message.
+
+        Returns:
+            None
+        """
+        loc_string = Validator.get_location_string(location, custom_file_cursor=custom_file_cursor)
+        sys.stdout.write(f"{style[0]}{marker} {loc_string}:\n{message}{style[1]}\n\n")
+
+
     @staticmethod
     def print_error(error: str, location: list[str], custom_file_cursor: tuple[int] | None = None):
         """Prints an error message with the given location.
@@ -184,14 +390,10 @@ class Validator:
         Returns:
             None
         """
+        if Validator.record_call("print_error", error, location, custom_file_cursor):
+            return
         Validator.errors += 1
-        loc_string = Validator.get_location_string(location, custom_file_cursor=custom_file_cursor)
-        txt = f"[!] {loc_string}:\n{error}"
-        if COLORAMA_INSTALLED:
-            print(f"{colorama.Fore.RED}{txt}{colorama.Fore.RESET}")
-        else:
-            print(txt)
-        print()
+        Validator.write_message("[!]", error, ERROR_STYLE, location, custom_file_cursor)
 
 
     @staticmethod
@@ -205,14 +407,10 @@ class Validator:
         Returns:
             None
         """
+        if Validator.record_call("print_fatal_error", error, location, custom_file_cursor):
+            return
         Validator.fatal_errors += 1
-        loc_string = Validator.get_location_string(location, custom_file_cursor=custom_file_cursor)
-        txt = f"[!!!] {loc_string}:\n{error}"
-        if COLORAMA_INSTALLED:
-            print(f"{colorama.Fore.RED}{colorama.Style.BRIGHT}{txt}{colorama.Fore.RESET}{colorama.Style.NORMAL}")
-        else:
-            print(txt)
-        print()
+        Validator.write_message("[!!!]", error, FATAL_ERROR_STYLE, location, custom_file_cursor)
 
 
     @staticmethod
@@ -226,13 +424,9 @@ class Validator:
         Returns:
             None
         """
-        loc_string = Validator.get_location_string(location, custom_file_cursor=custom_file_cursor)
-        txt = f"[*] {loc_string}:\n{warning}"
-        if COLORAMA_INSTALLED:
-            print(f"{colorama.Fore.YELLOW}{txt}{colorama.Fore.RESET}")
-        else:
-            print(txt)
-        print()
+        if Validator.record_call("print_warning", warning, location, custom_file_cursor):
+            return
+        Validator.write_message("[*]", warning, WARNING_STYLE, location, custom_file_cursor)
 
 
     @staticmethod
@@ -258,95 +452,176 @@ class Validator:
 
 
     @staticmethod
-    def entry_pretty_print(entry: xml.dom.minidom.Element) -> str:
+    def entry_pretty_print(entry: etree._Element, entry_id: str | None) -> str:
         """
-        Generate a pretty-printed string representation of an XML DOM Element.
+        Generate a pretty-printed string representation of an XML Element.
 
         Args:
-            entry (xml.dom.minidom.Element): The XML DOM Element to be pretty-printed.
+            entry (etree._Element): The XML Element to be pretty-printed.
+            entry_id (str | None): The 'Id' attribute of the element, if present.
 
         Returns:
             str: A formatted string representing the tag name and 'Id' attribute (if present) of the given element.
         Example: "TagName(Id='some_id')"
     """
-        return f"{entry.tagName}({repr(dict(entry.attributes.items()).get('Id'))})"
+        return f"{etree.QName(entry).localname}({repr(entry_id)})"
 
 
     @staticmethod
-    def check_unknown_tag(entry: xml.dom.minidom.Element, known_tags: list[str], location: list[str]) -> bool:
+    def check_unknown_tag(entry: etree._Element, known_tags: list[str], location: list[str]) -> bool:
         """Checks if an XML element's tag is in the list of known tags.
 
         Args:
-            entry (xml.etree.ElementTree.Element): The XML element to check.
+            entry (etree._Element): The XML element to check.
             known_tags (list[str]): List of known tag names.
             location (list[str]): A list of strings representing the location.
 
         Returns:
             bool: True if the tag is known, False otherwise.
         """
-        if entry.tagName in known_tags:
+        tag_name = etree.QName(entry).localname
+        if tag_name in known_tags:
             return True
         known_tags_str = ', '.join(known_tags[:Validator.display_limit])
-        Validator.print_error(f"Unknown tag: {repr(entry.tagName)}, "
-                              f"expected one of these: {known_tags_str}", location, entry.parse_position)
+        Validator.print_error(f"Unknown tag: {repr(tag_name)}, "
+                              f"expected one of these: {known_tags_str}", location, Validator.get_parse_position(entry))
         return False
 
 
     @staticmethod
-    def check_xml_files():
-        # pylint: disable=W0212
+    def check_xml_files(jobs: int = 1):
         """
         Validate and analyze XML files using the configured Validator settings.
 
-        Iterates through each XML file specified in `Validator.xml_files`. Performs the following tasks for each file:
-        - If DOMINATE_INSTALLED and Validator.preview_formatting are True, adds an h1 header with the file name to the main DOM.
-        - Attempts to parse the XML file using the configured custom XML parser.
+        Validates each XML file specified in `Validator.xml_files` with `Validator.check_xml_file`,
+        reading the next files in background threads while the current one is parsed. With more than one job,
+        files are validated in worker processes and their recorded calls are replayed in file order,
+        so the output is the same as a serial run.
+
+        Args:
+            jobs (int): The number of processes used to validate files. The formatting preview
+        is always generated serially, since the dominate document can't be shared between processes.
+
+        This function operates with the assumption that the Validator class is appropriately configured.
+        """
+        if jobs <= 1 or Validator.preview_formatting:
+            for file, content in prefetch_files(Validator.xml_files, FILE_PREFETCH_COUNT):
+                Validator.check_xml_file(file, content)
+            return
+        with ProcessPoolExecutor(jobs, initializer=Validator.configure,
+                                 initargs=(Validator.display_limit, Validator.show_lang, Validator.warnings_as_errors)) as executor:
+            for recorded_calls, total_strings in executor.map(validate_file, Validator.xml_files):
+                Validator.total_strings += total_strings
+                replay_calls(recorded_calls)
+
+
+    @staticmethod
+    def check_xml_file(file: str, content: Future[bytes] | None = None):
+        """
+        Validate and analyze a single XML file using the configured Validator settings.
+
+        Performs the following tasks for the file:
+        - If Validator.preview_formatting is True, adds an h1 header with the file name to the main DOM.
+        - Streams the XML file with lxml's iterparse, so that only the entry being checked is kept in memory.
         - Checks for common errors, unknown tags, and processes entries within the XML file.
         - Increments the total_strings count for each valid entry.
 
+        The messages of the file are collected and only printed once the whole file has been parsed,
+        so that a file with a syntax error only reports the fatal error, and none of its strings are counted.
+
+        Args:
+            file (str): The path of the XML file to validate.
+            content (Future[bytes] | None): The content of the file, if it is already being read.
+
         Note:
         - If a file is not found, a FileNotFoundError is caught and reported as an error.
-        - If there's a parsing error (SAXParseException), a fatal error is reported, and the custom XML parser is reset.
-        - SAXNotSupportedException is caught and ignored.
+        - If there's a parsing error (XMLSyntaxError), a fatal error is reported at the position where
+        libxml2 detected it, which can be further in the line than the one reported by Expat.
+        """
+        if Validator.preview_formatting:
+            with Validator.main_doc.body:
+                _get_dominate().tags.h1(file)
+        file_calls: list[tuple[str, tuple]] = []
+        outer_calls = Validator.recorded_calls
+        Validator.recorded_calls = file_calls
+        try:
+            data = content.result() if content is not None else read_file(file)
+            total_strings = Validator.check_xml_data(file, data)
+        except FileNotFoundError as err:
+            file_calls = [("print_error", (f"Invalid file: {err}", [file]))]
+            total_strings = 0
+        except etree.XMLSyntaxError as err:
+            file_calls = [("print_fatal_error", (f"Invalid file: {err.msg}", [file],
+                                                 (err.position[0], err.position[1] - 1)))]
+            total_strings = 0
+        finally:
+            Validator.recorded_calls = outer_calls
+            Validator.tag_occurrences.clear()
+        Validator.total_strings += total_strings
+        replay_calls(file_calls)
 
-        This function operates with the assumption that the Validator class is appropriately configured.
+
+    @staticmethod
+    def check_xml_data(file: str, data: bytes) -> int:
         """
-        Validator.custom_xml_parser = Validator.setup_xml_parser()
-        for file in Validator.xml_files:
-            if DOMINATE_INSTALLED and Validator.preview_formatting:
-                with Validator.main_doc.body:
-                    dominate.tags.h1(file)
-            try:
-                dom = xml.dom.minidom.parse(file, Validator.custom_xml_parser)
-                root: xml.dom.minidom.Element = dom.documentElement
-                path = [file, root.tagName]
-                for child in root.childNodes:
-                    child: xml.dom.minidom.Element
-                    if isinstance(child, xml.dom.minidom.Text):
-                        continue
-                    if Validator.check_unknown_tag(child, ["Entry"], path):
-                        Validator.check_entries(child, path)
-                        Validator.total_strings += 1
-            except FileNotFoundError as err:
-                Validator.print_error(f"Invalid file: {err}", [file])
-            except xml.sax.SAXParseException as err:
-                Validator.print_fatal_error(f"Invalid file: {err.getMessage()}", [file],
-                                            custom_file_cursor=(err.getLineNumber(), err.getColumnNumber()))
-                Validator.custom_xml_parser = Validator.setup_xml_parser()
-            except xml.sax._exceptions.SAXNotSupportedException:
-                pass
+        Stream the content of an XML file with lxml's iterparse, checking each entry once it has been parsed.
+
+        Only the entry being checked is kept in memory.
+
+        Args:
+            file (str): The path of the XML file, used for error reporting.
+            data (bytes): The content of the XML file.
+
+        Returns:
+            int: The number of entries with a known tag found in the file.
+
+        Raises:
+            etree.XMLSyntaxError: If the content is not well-formed.
+        """
+        check_unknown_tag = Validator.check_unknown_tag
+        check_entries = Validator.check_entries
+        known_tags = ["Entry"]
+        tag_occurrences = Validator.tag_occurrences
+        total_strings = 0
+        Validator.source_lines = data.split(b"\n")
+        root: etree._Element | None = None
+        path: list[str] = []
+        line = 0
+        line_tags: dict[str, int] = {}
+        for event, elem in etree.iterparse(io.BytesIO(data), events=("start", "end"), remove_comments=True):
+            if event == "start":
+                if elem.sourceline != line:
+                    line = elem.sourceline
+                    line_tags = {}
+                occurrence = line_tags.get(elem.tag, 0)
+                line_tags[elem.tag] = occurrence + 1
+                tag_occurrences[elem] = occurrence
+                if root is None:
+                    root = elem
+                    path = [file, etree.QName(root).localname]
+                continue
+            if elem.getparent() is not root:
+                continue
+            if check_unknown_tag(elem, known_tags, path):
+                check_entries(elem, path)
+                total_strings += 1
+            tag_occurrences.clear()
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del root[0]
+        return total_strings
 
 
     @staticmethod
-    def check_entries(entry: xml.dom.minidom.Element, path: list[str]):
+    def check_entries(entry: etree._Element, path: list[str]):
         """
-        Validate and analyze the entries within an XML DOM Element.
+        Validate and analyze the entries within an XML Element.
 
         Args:
-            entry (xml.dom.minidom.Element): The XML DOM Element representing an entry to be validated.
-            path (list[str]): The path to the current XML DOM Element, used for error reporting.
+            entry (etree._Element): The XML Element representing an entry to be validated.
+            path (list[str]): The path to the current XML Element, used for error reporting.
 
-        This function checks various aspects of each string entry within the given XML DOM Element, including:
+        This function checks various aspects of each string entry within the given XML Element, including:
             Presence of required attributes, such as 'Id' and 'xml:lang'.
             Correct usage of text formatting tags (~[s,b,r,n,y,p,g,o,h,c]~).
             Consistency and correctness of variables ({[0-9]+}) within the text.
@@ -358,74 +633,144 @@ class Validator:
         Note:
             The function assumes that the Validator class is appropriately configured.
         """
-        element_found_id = dict(entry.attributes.items()).get("Id")
-        element_location = entry.parse_position
+        element_found_id = entry.get("Id")
+        element_location = SourcePosition.from_element(entry)
+        for key in entry.keys():
+            if key not in KNOWN_ENTRY_ATTRIBS:
+                Validator.print_error(f"Unknown attribute: {repr(key)}", path, element_location.cursor)
         if element_found_id is None:
-            Validator.print_error("Found element without id!", path, custom_file_cursor=element_location)
+            Validator.print_error("Found element without id!", path, custom_file_cursor=element_location.cursor)
         else:
-            if element_found_id in Validator.used_ids:
-                Validator.print_error(f"Found element duplicate with id {repr(element_found_id)}!", path, custom_file_cursor=element_location)
-                Validator.total_strings -= 1
-            Validator.used_ids.add(element_found_id)
-            path = [*path, Validator.entry_pretty_print(entry)]
-            if DOMINATE_INSTALLED and Validator.preview_formatting:
-                with Validator.main_doc.body:
-                    dominate.tags.h2(element_found_id)
+            Validator.check_duplicate_id(element_found_id, path, element_location)
+            path = [*path, Validator.entry_pretty_print(entry, element_found_id)]
         translations, entry_info = Validator.analyze_entry(entry, path)
+        if Validator.preview_formatting:
+            Validator.preview_entry(element_found_id, translations, path)
+        check_translation = Validator.check_translation
         for translation in translations:
-            Validator.check_translation(translation, entry_info, path)
+            check_translation(translation, entry_info, path)
         if (Validator.show_lang is not None) and (Validator.show_lang not in entry_info.found_langs):
-            if Validator.found_missing_lang <= Validator.display_limit:
-                Validator.print_warning_or_error(f"Missing translation for {repr(Validator.show_lang)}!", path, element_location)
-            Validator.found_missing_lang += 1
+            Validator.report_missing_lang(path, element_location)
 
 
     @staticmethod
-    def analyze_entry(entry: xml.dom.minidom.Element, path: list[str]) -> tuple[list[xml.dom.minidom.Element], EntryInfo]:
+    def check_duplicate_id(entry_id: str, path: list[str], location: SourcePosition):
         """
-        Analyze an XML DOM Element representing an entry and extract relevant information.
+        Check that an entry id has not been used before, in the same file or in a previous one.
 
         Args:
-            entry (xml.dom.minidom.Element): The XML DOM Element representing an entry to be analyzed.
-            path (list[str]): The path to the current XML DOM Element, used for error reporting.
+            entry_id (str): The 'Id' attribute of the entry.
+            path (list[str]): The path to the entry, used for error reporting.
+            location (SourcePosition): The position of the entry in the file.
+        """
+        if Validator.record_call("check_duplicate_id", entry_id, path, location):
+            return
+        first_file = Validator.used_ids.get(entry_id)
+        if first_file is None:
+            Validator.used_ids[entry_id] = path[0]
+        else:
+            defined_in = "" if first_file == path[0] else f" (already defined in {first_file})"
+            Validator.print_error(f"Found element duplicate with id {repr(entry_id)}{defined_in}!",
+                                  path, custom_file_cursor=location.cursor)
+            Validator.total_strings -= 1
+
+
+    @staticmethod
+    def report_missing_lang(path: list[str], location: SourcePosition):
+        """
+        Report an entry missing the translation for Validator.show_lang, up to the display limit.
+
+        Args:
+            path (list[str]): The path to the entry, used for error reporting.
+            location (SourcePosition): The position of the entry in the file.
+        """
+        if Validator.record_call("report_missing_lang", path, location):
+            return
+        if Validator.found_missing_lang <= Validator.display_limit:
+            Validator.print_warning_or_error(f"Missing translation for {repr(Validator.show_lang)}!", path, location.cursor)
+        Validator.found_missing_lang += 1
+
+
+    @staticmethod
+    def analyze_entry(entry: etree._Element, path: list[str]) -> tuple[list[TranslationInfo], EntryInfo]:
+        """
+        Analyze an XML Element representing an entry and extract relevant information.
+
+        Args:
+            entry (etree._Element): The XML Element representing an entry to be analyzed.
+            path (list[str]): The path to the current XML Element, used for error reporting.
 
         Returns:
-            Tuple[List[xml.dom.minidom.Element], EntryInfo]: A tuple containing a list of translation elements
+            Tuple[List[TranslationInfo], EntryInfo]: A tuple containing a list of translations
         within the entry and an EntryInfo object representing information about the entry.
         """
-        translations: list[xml.dom.minidom.Element] = []
+        translations: list[TranslationInfo] = []
         entry_info = EntryInfo()
-        for child_node in entry.childNodes:
-            if isinstance(child_node, xml.dom.minidom.Text):
-                continue
-            child_node: xml.dom.minidom.Element
-            if Validator.check_unknown_tag(child_node, ["String"], path):
-                translations.append(child_node)
-                for key, value in child_node.attributes.items():
-                    if key != XML_LANG_ATTRIB:
-                        Validator.print_error(f"Unknown attribute: {repr(key)}", path, child_node.parse_position)
-                        continue
-                    if value == "en-US":
-                        found_formats = re.findall(SHORT_GTA_FORMAT_REGEX, str_from_node(child_node))
-                        if len(found_formats) > 0:
-                            entry_info.required_text_formatting = set(found_formats)
-                            entry_info.should_end_with_format = found_formats[-1]
-                        entry_info.required_variables = re.findall(TEXT_VARIABLE_REGEX, str_from_node(child_node))
-                    if value in entry_info.found_langs:
-                        Validator.print_error(f"Found duplicate string for {value}", path, child_node.parse_position)
-                    entry_info.found_langs.append(value)
+        found_langs = entry_info.found_langs
+        check_unknown_tag = Validator.check_unknown_tag
+        print_error = Validator.print_error
+        known_tags = ["String"]
+        for child_node in entry:
+            if check_unknown_tag(child_node, known_tags, path):
+                lang = child_node.get(XML_LANG_ATTRIB)
+                translation = TranslationInfo(child_node, lang, child_node.text or "")
+                translations.append(translation)
+                for key in child_node.keys():
+                    if key not in KNOWN_STRING_ATTRIBS:
+                        print_error(f"Unknown attribute: {repr(key)}", path, translation.parse_position)
+                if lang is not None:
+                    if lang in found_langs:
+                        print_error(f"Found duplicate string for {lang}", path, translation.parse_position)
+                    found_langs[lang] = translation
+        english_translation = entry_info.found_langs.get("en-US")
+        if english_translation is not None:
+            found_formats = SHORT_GTA_FORMAT_PATTERN.findall(english_translation.text)
+            if len(found_formats) > 0:
+                entry_info.required_text_formatting = set(found_formats)
+                entry_info.should_end_with_format = found_formats[-1]
+            entry_info.required_variables = TEXT_VARIABLE_PATTERN.findall(english_translation.text)
         return (translations, entry_info)
 
 
     @staticmethod
-    def check_translation(string_entry: xml.dom.minidom.Element, info: EntryInfo, path: list[str]):
+    def preview_entry(entry_id: str | None, translations: list[TranslationInfo], path: list[str]):
+        """
+        Add the formatted translations of an entry to the formatting preview document.
+
+        Reports HUD colors that are missing from the color table, which are previewed with the default color,
+        as warnings, or as errors if warnings are treated as errors.
+
+        Args:
+            entry_id (str | None): The 'Id' attribute of the entry, shown as a header if present.
+            translations (list[TranslationInfo]): The translations of the entry to be previewed.
+            path (list[str]): The path to the entry, used for warning reporting.
+
+        Note:
+            The function must only be called when Validator.preview_formatting is True.
+        """
+        tags = _get_dominate().tags
+        formatted_string_to_html = _get_html_preview().formatted_string_to_html
+        with Validator.main_doc.body:
+            if entry_id is not None:
+                tags.h2(entry_id)
+            for translation in translations:
+                unknown_colors: list[str] = []
+                tags.h3(translation.lang)
+                formatted_string_to_html(translation.text, unknown_colors)
+                for color_name in unknown_colors:
+                    Validator.print_warning_or_error(f"Unknown HUD color {repr(color_name)}, previewed with the default color",
+                                                     [*path, translation.lang], translation.text_position)
+
+
+    @staticmethod
+    def check_translation(translation: TranslationInfo, info: EntryInfo, path: list[str]):
         """
-        Validate and analyze the translation string within an XML DOM Element.
+        Validate and analyze the translation string within an XML Element.
 
         Args:
-            string_entry (xml.dom.minidom.Element): The XML DOM Element representing the translation string to be checked.
+            translation (TranslationInfo): The translation string to be checked.
             info (EntryInfo): An EntryInfo object containing information about the entry, such as required formats and variables.
-            path (list[str]): The path to the current XML DOM Element, used for error reporting.
+            path (list[str]): The path to the current XML Element, used for error reporting.
 
         This function checks various aspects of the translation string, including:
         - Proper usage of text formatting tags (~[s,b,r,n,y,p,g,o,h,c]~).
@@ -438,96 +783,123 @@ class Validator:
         Note:
             The function assumes that the Validator class is appropriately configured.
         """
-        text = str_from_node(string_entry)
-        current_lang: str = dict(string_entry.attributes.items()).get(XML_LANG_ATTRIB)
-        start_position: tuple[int] = (
-            string_entry.parse_position[0],
-            string_entry.parse_position[1]+len('<String xml:lang="')+len(current_lang)+len('">'))
+        text = translation.text
+        current_lang: str = translation.lang
         path1 = [*path, current_lang]
-        if DOMINATE_INSTALLED and Validator.preview_formatting:
-            with Validator.main_doc.body:
-                dominate.tags.h3(current_lang)
-                lib.html_preview.formatted_string_to_html(text)
-        found_formats: list[str] = re.findall(SHORT_GTA_FORMAT_REGEX, text)
+        found_formats: list[str] = []
+        found_variables: list[str] = []
+        invalid_text_formatting_loc: int = -1
+        for token in TEXT_TOKEN_PATTERN.finditer(text):
+            token: re.Match
+            kind = token.lastgroup
+            if kind == "format":
+                found_formats.append(token.group())
+            elif kind == "variable":
+                found_variables.append(token.group())
+            elif invalid_text_formatting_loc == -1:
+                invalid_text_formatting_loc = token.start()
         if len(found_formats)>0 and info.should_end_with_format is not None:
             found_formats_set = set(found_formats)
             invalid_text_formatting = found_formats_set.difference(info.required_text_formatting)
             missing_text_formatting = info.required_text_formatting.difference(found_formats_set)
             formatting_duplicate = get_consecutive_duplicate(found_formats, exceptions=["~h~","~n~","~s~"])
             if invalid_text_formatting:
-                pos = (start_position[0],
-                       start_position[1] + text.find(list(invalid_text_formatting)[0]))
+                pos = (translation.text_position[0],
+                       translation.text_position[1] + text.find(list(invalid_text_formatting)[0]))
                 Validator.print_error(f"Found invalid text formatting: {', '.join(invalid_text_formatting)}", path1, pos)
             if missing_text_formatting:
-                Validator.print_error(f"Missing text formatting: {', '.join(missing_text_formatting)}", path1, start_position)
+                Validator.print_error(f"Missing text formatting: {', '.join(missing_text_formatting)}", path1, translation.text_position)
             if formatting_duplicate:
-                pos = (start_position[0],
-                       start_position[1] + text.rfind(formatting_duplicate))
+                pos = (translation.text_position[0],
+                       translation.text_position[1] + text.rfind(formatting_duplicate))
                 Validator.print_error(f"Found text formatting duplicate: {formatting_duplicate}", path1, pos)
             found_format = found_formats[-1]
             if found_format != info.should_end_with_format:
-                pos = (start_position[0],
-                       start_position[1] + text.rfind(found_format))
+                pos = (translation.text_position[0],
+                       translation.text_position[1] + text.rfind(found_format))
                 Validator.print_error(f"String ends with a wrong format {repr(found_format)}, "
                                         f"expected {repr(info.should_end_with_format)}", path1, pos)
-        found_variables = re.findall(TEXT_VARIABLE_REGEX, text)
         if len(found_variables) < len(info.required_variables):
             missing_variables = [var for var in info.required_variables if var not in found_variables]
             if missing_variables:
-                Validator.print_error(f"Missing variables: {', '.join(missing_variables)}", path1, start_position)
+                Validator.print_error(f"Missing variables: {', '.join(missing_variables)}", path1, translation.text_position)
         elif len(found_variables) > len(info.required_variables):
             unneeded_variables = [var for var in found_variables if var not in info.required_variables]
             if unneeded_variables:
-                pos = (start_position[0],
-                       start_position[1] + text.rfind(unneeded_variables[-1]))
+                pos = (translation.text_position[0],
+                       translation.text_position[1] + text.rfind(unneeded_variables[-1]))
                 Validator.print_error(f"Found too many variables: {', '.join(unneeded_variables)}", path1, pos)
         if len(text) == 0:
-            Validator.print_error("Found empty translation", path1, start_position)
-        text_without_formatting = re.sub(SHORT_GTA_FORMAT_REGEX, "", text)
-        invalid_text_formatting_loc = text_without_formatting.find("~")
+            Validator.print_error("Found empty translation", path1, translation.text_position)
         if invalid_text_formatting_loc != -1:
-            offset: int = 0
-            for valid_text_formatting_match in re.finditer(SHORT_GTA_FORMAT_REGEX, text):
-                valid_text_formatting_match: re.Match
-                if valid_text_formatting_match.end() > invalid_text_formatting_loc + offset:
-                    offset += valid_text_formatting_match.end()-valid_text_formatting_match.start()
-                else:
-                    break
-            real_location = text[(invalid_text_formatting_loc + offset):].find("~")+(invalid_text_formatting_loc + offset)
-            position: tuple[int] = (start_position[0], start_position[1]+real_location)
+            position: tuple[int] = (translation.text_position[0], translation.text_position[1]+invalid_text_formatting_loc)
             Validator.print_error("Found invalid text formatting (~)", path1, position)
-        too_many_spaces_match: re.Match = re.search(TOO_MANY_SPACES_REGEX, text)
+        too_many_spaces_match: re.Match = TOO_MANY_SPACES_PATTERN.search(text)
         if too_many_spaces_match:
-            position: tuple[int] = (start_position[0], start_position[1]+too_many_spaces_match.end()-1)
+            position: tuple[int] = (translation.text_position[0], translation.text_position[1]+too_many_spaces_match.end()-1)
             Validator.print_warning_or_error("Found too many spaces between words", path1, position)
-        wrong_punctuation_match: re.Match = re.search(WRONG_PUNCTUATION_REGEX, text)
+        wrong_punctuation_match: re.Match = WRONG_PUNCTUATION_PATTERN.search(text)
         if wrong_punctuation_match:
-            position: tuple[int] = (start_position[0], start_position[1]+wrong_punctuation_match.start())
+            position: tuple[int] = (translation.text_position[0], translation.text_position[1]+wrong_punctuation_match.start())
             Validator.print_warning_or_error("Found invalid punctuation mark placement", path1, position)
 
 
+def replay_calls(calls: list[tuple[str, tuple]]):
+    """
+    Execute calls recorded with Validator.record_call, in order.
+
+    Args:
+        calls (list[tuple[str, tuple]]): The names of the Validator methods with their arguments.
+    """
+    for name, call_args in calls:
+        getattr(Validator, name)(*call_args)
+
+
+def validate_file(file: str) -> tuple[list[tuple[str, tuple]], int]:
+    """
+    Validate a single XML file in a worker process.
+
+    Args:
+        file (str): The path of the XML file to validate.
+
+    Returns:
+        tuple[list[tuple[str, tuple]], int]: The calls recorded while validating the file,
+    to be replayed by the main process, and the number of strings found in it.
+    """
+    Validator.recorded_calls = []
+    Validator.total_strings = 0
+    Validator.check_xml_file(file)
+    return (Validator.recorded_calls, Validator.total_strings)
+
+
 if __name__ == '__main__':
-    if COLORAMA_INSTALLED:
+    # The optional dependencies are only imported when they are used: colorama strips colors
+    # from output that isn't a terminal anyway, and dominate is only needed for the preview.
+    colorama = _get_colorama() if sys.stdout.isatty() else None
+    if colorama is not None:
         colorama.init()
+        ERROR_STYLE = (colorama.Fore.RED, colorama.Fore.RESET)
+        FATAL_ERROR_STYLE = (f"{colorama.Fore.RED}{colorama.Style.BRIGHT}", f"{colorama.Fore.RESET}{colorama.Style.NORMAL}")
+        WARNING_STYLE = (colorama.Fore.YELLOW, colorama.Fore.RESET)
     parser = argparse.ArgumentParser(description='Validates localization files')
-    parser.add_argument('--show_lang', type=str, help='Show missing language localizations', choices=Validator.supported_langs)
+    parser.add_argument('--show_lang', type=str, help='Show missing language localizations', choices=sorted(Validator.supported_langs))
     parser.add_argument('--preview_formatting', action='store_true', help='Show formatted localizations as HTML file')
     parser.add_argument('--treat_warnings_as_errors', action='store_true', help='Treat warnings as errors')
     parser.add_argument('--display_limit', type=int, default=10, help='Set display limit for missing translations')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of processes used to validate files')
     args = parser.parse_args()
     if args.preview_formatting:
-        if DOMINATE_INSTALLED:
+        html_preview = _get_html_preview()
+        if html_preview is not None:
             Validator.preview_formatting = True
-            Validator.main_doc = lib.html_preview.create_html_doc()
+            Validator.main_doc = html_preview.create_html_doc()
         else:
             print("Unable to generate preview, dominate is not installed")
             print("You need to install it with 'pip install dominate'")
-    Validator.display_limit = args.display_limit
-    Validator.warnings_as_errors = args.treat_warnings_as_errors
-    Validator.show_lang = args.show_lang
+    Validator.configure(args.display_limit, args.show_lang, args.treat_warnings_as_errors)
     with open("index.json", "r", encoding="utf-8") as index_file:
         Validator.xml_files = json.load(index_file)
-    Validator.check_xml_files()
+    Validator.check_xml_files(args.jobs)
     if Validator.show_lang is not None:
         print(f"Total missing translations for {repr(Validator.show_lang)}: {Validator.found_missing_lang}. "
               f"Progress: {Validator.total_strings - Validator.found_missing_lang}/{Validator.total_strings} "
@@ -544,5 +916,5 @@ if __name__ == '__main__':
         sys.exit(1)
     else:
         print("No errors found")
-    if COLORAMA_INSTALLED:
+    if colorama is not None:
         colorama.deinit()